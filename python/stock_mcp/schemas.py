@@ -0,0 +1,55 @@
+"""
+Twelve Data Response Schemas
+
+This module defines typed msgspec structs for the Twelve Data API responses
+used by the server, so payloads are decoded straight into the fields we read.
+"""
+
+from typing import Optional, Union
+
+import msgspec
+
+
+class Quote(msgspec.Struct):
+    """
+    Response from the /quote endpoint.
+
+    Every field is optional because error payloads only carry status, code
+    and message. Unknown keys in the response are skipped while decoding.
+    The change fields default to UNSET so a missing value can be told apart
+    from an explicit null.
+    """
+    close: Optional[str] = None
+    change: Union[Optional[str], msgspec.UnsetType] = msgspec.UNSET
+    percent_change: Union[Optional[str], msgspec.UnsetType] = msgspec.UNSET
+    previous_close: Optional[str] = None
+    high: Optional[str] = None
+    low: Optional[str] = None
+    volume: Optional[str] = None
+    exchange: Optional[str] = None
+    status: Optional[str] = None
+    code: Optional[int] = None
+    message: Optional[str] = None
+
+
+class EOD(msgspec.Struct):
+    """
+    Response from the /eod endpoint.
+
+    Only the fields needed to format a historical bar (plus the error
+    fields) are declared; everything else is skipped while decoding.
+    """
+    datetime: Optional[str] = None
+    open: Optional[str] = None
+    high: Optional[str] = None
+    low: Optional[str] = None
+    close: Optional[str] = None
+    volume: Optional[str] = None
+    status: Optional[str] = None
+    code: Optional[int] = None
+    message: Optional[str] = None
+
+
+# Decoders are built once and reused for every response
+quote_decoder = msgspec.json.Decoder(Quote)
+eod_decoder = msgspec.json.Decoder(EOD)
@@ -6,24 +6,38 @@ This server implements:
 - Stock price resources accessible via URIs (stock://SYMBOL/)
 - Historical closing prices via URIs (stock://SYMBOL/closingdate/YYYY-MM-DD)
 - MCP tool functions for better client compatibility
-- STDIO transport for communication
+- STDIO transport by default, with SSE (HTTP) available via STOCK_MCP_TRANSPORT
 - Integration with Twelve Data API for real-time and historical stock data
 
 Built using FastMCP from the official MCP Python SDK.
 """
 
+import asyncio
+import re
 import sys
+import threading
+import time
 import traceback
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
+from zoneinfo import ZoneInfo
 
+import diskcache
+import httpx
 from fastmcp import FastMCP
-from twelvedata import TDClient
 import os
 from dotenv import load_dotenv
 
+try:
+    import uvloop
+    _HAS_UVLOOP = True
+except ImportError:  # uvloop is not available on Windows
+    _HAS_UVLOOP = False
+
 # Import the formatting function from our separate module
-from .stock_formatter import format_data
+from .stock_formatter import format_eod, format_quote, format_timestamp
+from .schemas import EOD, eod_decoder, quote_decoder
 
 # Helper function for logging to stderr (doesn't interfere with STDIO transport)
 def log(message: str):
@@ -39,8 +53,55 @@ api_key = os.getenv('TWELVE_DATA_API_KEY')
 if not api_key:
     raise ValueError("TWELVE_DATA_API_KEY environment variable is required")
 
-# Initialize the TwelveData client
-twelve_data_client = TDClient(apikey=api_key)
+# Full tracebacks for fetch errors are only rendered when debugging
+_DEBUG = os.getenv('STOCK_MCP_DEBUG') == '1'
+
+# Twelve Data REST endpoints, called directly rather than through the SDK
+_QUOTE_URL = "https://api.twelvedata.com/quote"
+_EOD_URL = "https://api.twelvedata.com/eod"
+
+# Shared HTTP client for Twelve Data requests, created lazily on the running loop
+_client: Optional[httpx.AsyncClient] = None
+_client_lock = asyncio.Lock()
+
+# Precompiled matchers used to reject bad arguments before any network call
+# Symbols are alphanumeric runs joined by single '.', '-', '/' or ':'
+# separators (BRK.B, EUR/USD, TRP:TSX), capped at 10 characters
+_SYMBOL_RE = re.compile(r"(?=.{1,10}\Z)[A-Za-z0-9]+(?:[.\-/:][A-Za-z0-9]+)*")
+_DATE_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
+
+# Caps concurrent outbound requests so batch lookups stay within API rate limits
+_MAX_CONCURRENT_REQUESTS = 8
+_request_semaphore = asyncio.Semaphore(_MAX_CONCURRENT_REQUESTS)
+
+# In-memory response caches. Quotes are only reused for a short window, while
+# EOD data for a completed trading day never changes and is kept until evicted.
+_CURRENT_CACHE_TTL = 2.0
+_CACHE_MAX_ENTRIES = 4096
+_current_cache: OrderedDict[str, Tuple[float, str]] = OrderedDict()
+_eod_cache: OrderedDict[Tuple[str, str], str] = OrderedDict()
+
+# Trading days are judged complete in the exchange's timezone, not the
+# server's, so a host east of New York never caches a bar still trading
+_EXCHANGE_TZ = ZoneInfo('America/New_York')
+
+# Persistent cache for EOD results of completed trading days, so restarts
+# don't have to re-fetch immutable history. It is opened on first use and is
+# purely an optimisation: any failure is logged and requests carry on without it.
+_CACHE_DIR = os.path.expanduser(os.getenv('STOCK_MCP_CACHE_DIR', '~/.cache/stock_mcp'))
+_disk_cache: Optional[diskcache.Cache] = None
+_disk_cache_lock = threading.Lock()
+
+# Outstanding API calls keyed like the caches, so concurrent identical
+# lookups share one request instead of each hitting Twelve Data
+_inflight: Dict[Any, asyncio.Future] = {}
+
+# Transport settings; STDIO suits clients that launch the server as a
+# subprocess, SSE (opt-in) lets many MCP clients share one server process
+_TRANSPORT = os.getenv('STOCK_MCP_TRANSPORT', 'stdio')
+_HOST = os.getenv('STOCK_MCP_HOST', '127.0.0.1')
+_PORT = int(os.getenv('STOCK_MCP_PORT', '8000'))
+
 
 # Create the FastMCP server instance
 mcp = FastMCP("stock-mcp")
@@ -49,7 +110,131 @@ mcp = FastMCP("stock-mcp")
 # INTERNAL/SHARED FUNCTIONS
 # ==========================================
 
-def _fetch_current_stock_price(symbol: str) -> str:
+async def _get_client() -> httpx.AsyncClient:
+    """
+    Return the shared httpx client, creating it on first use.
+    
+    Returns:
+        The module-wide AsyncClient used for all Twelve Data requests
+    """
+    global _client
+    async with _client_lock:
+        if _client is None or _client.is_closed:
+            # HTTP/2 multiplexes concurrent lookups over a few kept-alive
+            # connections, so TLS handshakes and sockets are shared
+            # The API key is a client-level default param, so each request
+            # only supplies its own symbol/date
+            _client = httpx.AsyncClient(
+                http2=True,
+                params={"apikey": api_key},
+                limits=httpx.Limits(max_connections=4, max_keepalive_connections=4),
+                timeout=10.0
+            )
+        return _client
+
+
+def _cache_store(cache: OrderedDict, key: Any, value: Any) -> None:
+    """
+    Insert a value into an LRU cache, evicting the oldest entry when full.
+    
+    Args:
+        cache: OrderedDict used as the LRU store
+        key: Cache key
+        value: Value to store
+    """
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > _CACHE_MAX_ENTRIES:
+        cache.popitem(last=False)
+
+
+def _get_disk_cache() -> diskcache.Cache:
+    """
+    Return the persistent EOD cache, opening it on first use.
+    
+    Returns:
+        The module-wide diskcache.Cache
+    """
+    global _disk_cache
+    with _disk_cache_lock:
+        if _disk_cache is None:
+            _disk_cache = diskcache.Cache(_CACHE_DIR)
+        return _disk_cache
+
+
+def _disk_cache_get(key: Tuple[str, str]) -> Optional[str]:
+    """
+    Read a formatted EOD result from the disk cache, ignoring cache failures.
+    
+    Args:
+        key: Normalized (symbol, date) pair
+    
+    Returns:
+        The cached result, or None on a miss or if the cache is unusable
+    """
+    try:
+        return _get_disk_cache().get(key)
+    except Exception as e:
+        log(f"Disk cache read failed for {key}: {e}")
+        return None
+
+
+def _disk_cache_set(key: Tuple[str, str], value: str) -> None:
+    """
+    Write a formatted EOD result to the disk cache, ignoring cache failures.
+    
+    Args:
+        key: Normalized (symbol, date) pair
+        value: Formatted EOD result
+    """
+    try:
+        _get_disk_cache().set(key, value)
+    except Exception as e:
+        log(f"Disk cache write failed for {key}: {e}")
+
+
+def _is_completed_trading_day(date_obj: datetime) -> bool:
+    """
+    Check whether a date's EOD bar is final, i.e. the day is over in New York.
+    
+    Args:
+        date_obj: Requested trading date
+    
+    Returns:
+        True if the date is before today's date in the exchange timezone
+    """
+    return date_obj.date() < datetime.now(_EXCHANGE_TZ).date()
+
+
+async def _single_flight(key: Any, fetch: Callable[[], Awaitable[str]]) -> str:
+    """
+    Run a fetch once per key, letting concurrent callers await the same result.
+    
+    The fetch runs in its own task and every caller awaits it through
+    asyncio.shield, so a cancelled caller (e.g. a dropped client) only stops
+    its own wait; the shared fetch and the other callers carry on.
+    
+    Args:
+        key: Identity of the request (same shape as the cache keys)
+        fetch: Zero-argument coroutine factory performing the actual request
+    
+    Returns:
+        The result of the fetch, shared by every caller that joined it
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _inflight[key] = task
+        
+        def _forget(done: asyncio.Future) -> None:
+            if _inflight.get(key) is done:
+                del _inflight[key]
+        
+        task.add_done_callback(_forget)
+    return await asyncio.shield(task)
+
+
+async def _fetch_current_stock_price(symbol: str, timestamp: Optional[str] = None) -> str:
     """
     Internal function to fetch current stock price with change information.
     
@@ -58,6 +243,34 @@ def _fetch_current_stock_price(symbol: str) -> str:
     
     Args:
         symbol: Stock symbol (e.g., 'AAPL', 'MSFT', 'GOOGL')
+        timestamp: Optional preformatted retrieval time shared by a batch
+    
+    Returns:
+        Formatted string with current price and change data
+    """
+    if not _SYMBOL_RE.fullmatch(symbol):
+        return f"Error: Invalid symbol '{symbol}'"
+    
+    # Interned so repeated lookups of hot symbols share one key object
+    key = sys.intern(symbol.upper())
+    cached = _current_cache.get(key)
+    if cached is not None and time.monotonic() - cached[0] < _CURRENT_CACHE_TTL:
+        _current_cache.move_to_end(key)
+        return cached[1]
+    
+    return await _single_flight(
+        key, lambda: _request_current_stock_price(symbol, key, timestamp)
+    )
+
+
+async def _request_current_stock_price(symbol: str, key: str, timestamp: Optional[str]) -> str:
+    """
+    Request a quote from Twelve Data, format it and cache the result.
+    
+    Args:
+        symbol: Stock symbol as given by the caller
+        key: Normalized (upper-case) symbol used for the request and cache
+        timestamp: Optional preformatted retrieval time shared by a batch
     
     Returns:
         Formatted string with current price and change data
@@ -66,19 +279,31 @@ def _fetch_current_stock_price(symbol: str) -> str:
     
     try:
         # Use the quote endpoint for comprehensive current data
-        quote_data = twelve_data_client.quote(symbol=symbol.upper()).as_json()
+        client = await _get_client()
+        async with _request_semaphore:
+            resp = await client.get(_QUOTE_URL, params={"symbol": key})
+        # Decode only the quote fields we use, straight into a typed struct
+        quote = quote_decoder.decode(resp.content)
+        
+        # Check for API error in response (the SDK used to raise on these)
+        if quote.status == 'error':
+            error_msg = quote.message or 'Unknown API error'
+            return f"API Error: {error_msg}"
         
         # Format and return the response using our imported function
-        return format_data(quote_data, symbol.upper())
+        result = format_quote(quote, key, timestamp=timestamp)
+        _cache_store(_current_cache, key, (time.monotonic(), result))
+        return result
         
     except Exception as e:
         error_msg = f"Error fetching stock data for {symbol}: {str(e)}"
         log(error_msg)
-        log(traceback.format_exc())
+        if _DEBUG:
+            log(traceback.format_exc())
         return f"Error: {error_msg}"
 
 
-def _fetch_historical_stock_price(symbol: str, date: str) -> str:
+async def _fetch_historical_stock_price(symbol: str, date: str) -> str:
     """
     Internal function to fetch historical closing price for a specific date.
     
@@ -92,50 +317,100 @@ def _fetch_historical_stock_price(symbol: str, date: str) -> str:
     Returns:
         Formatted string with historical closing price data
     """
-    log(f"Fetching EOD data for {symbol} on {date}")
+    if not _SYMBOL_RE.fullmatch(symbol):
+        return f"Error: Invalid symbol '{symbol}'"
+    
+    key = (sys.intern(symbol.upper()), date)
+    cached = _eod_cache.get(key)
+    if cached is not None:
+        _eod_cache.move_to_end(key)
+        return cached
     
     # Validate date format
+    match = _DATE_RE.fullmatch(date)
+    if not match:
+        return f"Error: Invalid date format '{date}'. Use YYYY-MM-DD"
     try:
-        date_obj = datetime.strptime(date, '%Y-%m-%d')
+        year, month, day = map(int, match.groups())
+        date_obj = datetime(year, month, day)
         # Check if the date is a weekend (markets are closed)
         if date_obj.weekday() >= 5:  # Saturday = 5, Sunday = 6
             return f"Warning: {date} is a weekend. Stock markets are typically closed. Try a weekday date."
     except ValueError:
         return f"Error: Invalid date format '{date}'. Use YYYY-MM-DD"
     
+    if _is_completed_trading_day(date_obj):
+        # diskcache does blocking SQLite I/O, so keep it off the event loop
+        cached = await asyncio.to_thread(_disk_cache_get, key)
+        if cached is not None:
+            _cache_store(_eod_cache, key, cached)
+            return cached
+    
+    return await _single_flight(
+        key, lambda: _request_historical_stock_price(symbol, date, date_obj, key)
+    )
+
+
+async def _request_historical_stock_price(
+    symbol: str,
+    date: str,
+    date_obj: datetime,
+    key: Tuple[str, str]
+) -> str:
+    """
+    Request EOD data from Twelve Data, format it and cache final results.
+    
+    Args:
+        symbol: Stock symbol as given by the caller
+        date: Validated date in YYYY-MM-DD format
+        date_obj: Parsed form of date
+        key: Normalized (symbol, date) pair used for the cache
+    
+    Returns:
+        Formatted string with historical closing price data
+    """
+    log(f"Fetching EOD data for {symbol} on {date}")
+    
     try:
         # Use the EOD (End of Day) endpoint for historical closing price data
         # This is specifically designed for getting historical end-of-day data
-        eod_data = twelve_data_client.eod(
-            symbol=symbol.upper(),
-            date=date
-        ).as_json()
+        client = await _get_client()
+        async with _request_semaphore:
+            resp = await client.get(_EOD_URL, params={"symbol": key[0], "date": date})
+        # Decode only the bar fields we use, skipping the rest of the payload
+        eod = eod_decoder.decode(resp.content)
         
         # Check if we got valid data from EOD endpoint
-        if not eod_data:
+        if eod == EOD():
             return f"Error: No EOD data returned for {symbol} on {date}"
         
         # Check for API error in response
-        if 'status' in eod_data and eod_data['status'] == 'error':
-            error_msg = eod_data.get('message', 'Unknown API error')
+        if eod.status == 'error':
+            error_msg = eod.message or 'Unknown API error'
             return f"API Error: {error_msg}"
         
         # Check if the response indicates no data available
-        if 'code' in eod_data and eod_data['code'] == 400:
-            error_msg = eod_data.get('message', 'No data available for this date')
+        if eod.code == 400:
+            error_msg = eod.message or 'No data available for this date'
             return f"No data available: {error_msg}"
         
         # Check if we have the required closing price data
-        if 'close' not in eod_data or eod_data['close'] is None:
+        if eod.close is None:
             return f"No closing price data available for {symbol} on {date}. Markets may have been closed."
         
         # Format and return the response using our imported function
-        return format_data(eod_data, symbol.upper(), date)
+        result = format_eod(eod, key[0], date)
+        # Only completed trading days are final; today's bar may still change
+        if _is_completed_trading_day(date_obj):
+            _cache_store(_eod_cache, key, result)
+            await asyncio.to_thread(_disk_cache_set, key, result)
+        return result
         
     except Exception as e:
         error_msg = f"Error fetching EOD data for {symbol} on {date}: {str(e)}"
         log(error_msg)
-        log(traceback.format_exc())
+        if _DEBUG:
+            log(traceback.format_exc())
         return f"Error: {error_msg}"
 
 
@@ -251,6 +526,9 @@ def stock_usage_guide_prompt() -> str:
         
         Returns: Current price, change, percentage change, day high/low, volume, exchange
 
+        To look up several symbols at once, use get_multiple_stock_prices(symbols),
+        e.g. get_multiple_stock_prices(symbols=["AAPL", "MSFT", "GOOGL"])
+
         2. HISTORICAL STOCK PRICES (End-of-Day Data)
         Resource Pattern: stock://{SYMBOL}/closingdate/{YYYY-MM-DD}
         Tool: get_historical_stock_price(symbol, date)
@@ -264,6 +542,8 @@ def stock_usage_guide_prompt() -> str:
 
         SYMBOL REQUIREMENTS:
         - Use standard stock ticker symbols (typically 1-5 characters)
+        - Letters, digits, '.', '-', '/' and ':' only, at most 10 characters
+          (e.g. BRK.B, EUR/USD, TRP:TSX; pairs with '/' work with the tools only)
         - Symbols are case-insensitive (AAPL = aapl = Aapl)
         - Must be valid symbols traded on supported exchanges
 
@@ -290,7 +570,7 @@ def stock_usage_guide_prompt() -> str:
 # ==========================================
 
 @mcp.resource("stock://{symbol}")
-def get_stock_price(symbol: str) -> str:
+async def get_stock_price(symbol: str) -> str:
     """
     Get current stock price with change information.
     
@@ -304,11 +584,11 @@ def get_stock_price(symbol: str) -> str:
         Formatted string with current price and change data
     """
     log(f"Resource call: stock://{symbol}")
-    return _fetch_current_stock_price(symbol)
+    return await _fetch_current_stock_price(symbol)
 
 
 @mcp.resource("stock://{symbol}/closingdate/{date}")
-def get_stock_closing_price(symbol: str, date: str) -> str:
+async def get_stock_closing_price(symbol: str, date: str) -> str:
     """
     Get historical closing price for a specific date using EOD (End of Day) data.
     
@@ -323,7 +603,7 @@ def get_stock_closing_price(symbol: str, date: str) -> str:
         Formatted string with closing price data
     """
     log(f"Resource call: stock://{symbol}/closingdate/{date}")
-    return _fetch_historical_stock_price(symbol, date)
+    return await _fetch_historical_stock_price(symbol, date)
 
 
 # ==========================================
@@ -331,7 +611,7 @@ def get_stock_closing_price(symbol: str, date: str) -> str:
 # ==========================================
 
 @mcp.tool()
-def get_current_stock_price(symbol: str) -> str:
+async def get_current_stock_price(symbol: str) -> str:
     """
     Get current stock price with change information using MCP tool interface.
     
@@ -345,11 +625,11 @@ def get_current_stock_price(symbol: str) -> str:
         Formatted string with current price and change data
     """
     log(f"Tool call: get_current_stock_price for {symbol}")
-    return _fetch_current_stock_price(symbol)
+    return await _fetch_current_stock_price(symbol)
 
 
 @mcp.tool()
-def get_historical_stock_price(symbol: str, date: str) -> str:
+async def get_historical_stock_price(symbol: str, date: str) -> str:
     """
     Get historical closing price for a specific date using MCP tool interface.
     
@@ -364,15 +644,63 @@ def get_historical_stock_price(symbol: str, date: str) -> str:
         Formatted string with historical closing price data
     """
     log(f"Tool call: get_historical_stock_price for {symbol} on {date}")
-    return _fetch_historical_stock_price(symbol, date)
+    return await _fetch_historical_stock_price(symbol, date)
+
+
+@mcp.tool()
+async def get_multiple_stock_prices(symbols: List[str]) -> str:
+    """
+    Get current stock prices for several symbols in one call.
+    
+    Lookups are issued concurrently, so the batch completes in roughly the
+    time of the slowest single request rather than the sum of all of them.
+    
+    Args:
+        symbols: List of stock symbols (e.g., ['AAPL', 'MSFT', 'GOOGL'])
+    
+    Returns:
+        Formatted current price data for each symbol, separated by blank lines
+    """
+    log(f"Tool call: get_multiple_stock_prices for {', '.join(symbols)}")
+    timestamp = format_timestamp()
+    results = await asyncio.gather(
+        *(_fetch_current_stock_price(symbol, timestamp) for symbol in symbols),
+        return_exceptions=True
+    )
+    return "\n\n".join(
+        f"Error: Error fetching stock data for {symbol}: {result}"
+        if isinstance(result, BaseException) else result
+        for symbol, result in zip(symbols, results)
+    )
+
 
 
+async def _serve(transport_kwargs: Dict[str, Any]) -> None:
+    """
+    Run the MCP server, then release the process-wide resources.
+    
+    The shared HTTP client and disk cache serve every session, so they are
+    closed once here when the server stops rather than in a FastMCP lifespan
+    hook, which older FastMCP versions run per SSE session.
+    
+    Args:
+        transport_kwargs: Extra arguments for the selected transport
+    """
+    try:
+        await mcp.run_async(transport=_TRANSPORT, **transport_kwargs)
+    finally:
+        if _client is not None and not _client.is_closed:
+            await _client.aclose()
+        if _disk_cache is not None:
+            _disk_cache.close()
+
 
 def main():
     """
     Main entry point for the Stock MCP Server.
     
-    Starts the server with STDIO transport.
+    Starts the server on a uvloop event loop (when available) using the
+    transport selected by STOCK_MCP_TRANSPORT (STDIO by default).
     """
     try:
         log(
@@ -389,8 +717,15 @@ def main():
         - stock_historical_price - Guide for historical stock prices
         - stock_usage_guide - Complete usage instructions""")
         
-        # Run the FastMCP server with STDIO transport
-        mcp.run()
+        # Run the FastMCP server on uvloop with the configured transport
+        transport_kwargs: Dict[str, Any] = {}
+        if _TRANSPORT != 'stdio':
+            log(f"Listening on http://{_HOST}:{_PORT} ({_TRANSPORT})")
+            transport_kwargs = {'host': _HOST, 'port': _PORT}
+        if _HAS_UVLOOP:
+            uvloop.run(_serve(transport_kwargs))
+        else:
+            asyncio.run(_serve(transport_kwargs))
     except KeyboardInterrupt:
         log("Server shutdown requested by user")
     except Exception as e:
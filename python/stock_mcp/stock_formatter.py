@@ -4,77 +4,271 @@ Stock Data Formatter Module
 This module provides formatting functions for stock data responses.
 """
 
-from typing import Any, Dict, Optional
+import math
+from typing import Any, Dict, Final, Optional, Tuple
 from datetime import datetime
 
+from msgspec import UNSET
 
-def format_data(data: Dict[str, Any], symbol: str, date: Optional[str] = None) -> str:
+from .schemas import EOD, Quote
+
+
+# Separator line and response templates, built once at import time
+_BAR: Final = "=" * 40
+_TIMESTAMP_FORMAT: Final = "%Y-%m-%d %H:%M:%S"
+
+_HIST_TMPL: Final = (
+    "Stock Historical Data (EOD): {symbol}\n"
+    + _BAR + "\n"
+    "Date: {datetime}\n"
+    "Opening Price: ${open}\n"
+    "Closing Price: ${close}\n"
+    "Day High: ${high}\n"
+    "Day Low: ${low}\n"
+    "Volume: {volume}\n"
+    "Retrieved at: {timestamp}\n"
+)
+
+_CURRENT_TMPL: Final = (
+    "Stock Price Data: {symbol}\n"
+    + _BAR + "\n"
+    "Current Price: ${price}\n"
+    "Change: {change_str} ({percent_str}) {direction}\n"
+    "Previous Close: ${previous_close}\n"
+    "Day High: ${high}\n"
+    "Day Low: ${low}\n"
+    "Volume: {volume}\n"
+    "Exchange: {exchange}\n"
+    "Retrieved at: {timestamp}\n"
+)
+
+def _to_float(value: Any) -> Optional[float]:
+    """
+    Convert an API value to float without raising for non-numeric input.
+    
+    Numbers are used directly and only strings that look numeric (after
+    surrounding whitespace, as float() allows, and including nan/inf) are
+    parsed, so the common case never pays for a raised exception.
+    
+    Args:
+        value: Raw value from the API (number, numeric string or other)
+    
+    Returns:
+        The float value, or None if the value is not numeric
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        text = value.strip()
+        if text and (text[0].isdigit() or text[0] in '+-.nNiI'):
+            try:
+                return float(text)
+            except ValueError:
+                return None
+    return None
+
+
+def _signed(value: float) -> str:
+    """Format a value to two decimals with an explicit sign; NaN stays unsigned."""
+    return f"{value:.2f}" if math.isnan(value) else f"{value:+.2f}"
+
+
+def _format_change(change_val: float, percent_val: float) -> Tuple[str, str, str]:
+    """
+    Build the direction indicator and signed change strings for a quote.
+    
+    Args:
+        change_val: Absolute price change
+        percent_val: Percentage price change
+    
+    Returns:
+        Tuple of (direction, change_str, percent_str)
+    """
+    direction: str = "📈" if change_val >= 0 else "📉"
+    return direction, _signed(change_val), _signed(percent_val) + "%"
+
+
+def _describe_change(change: Any, percent_change: Any) -> Tuple[str, str, str]:
+    """
+    Render raw change values, falling back to the raw text when not numeric.
+    
+    Args:
+        change: Absolute price change as returned by the API
+        percent_change: Percentage price change as returned by the API
+    
+    Returns:
+        Tuple of (direction, change_str, percent_str)
+    """
+    change_val = _to_float(change)
+    percent_val = _to_float(percent_change)
+    if change_val is not None and percent_val is not None:
+        return _format_change(change_val, percent_val)
+    if isinstance(change, (str, int, float)) and change != 'N/A':
+        return "", str(change), str(percent_change)
+    return "", "N/A", "N/A"
+
+
+def format_timestamp() -> str:
+    """Return the current local time in the 'Retrieved at' display format."""
+    return datetime.now().strftime(_TIMESTAMP_FORMAT)
+
+
+def _render_current(
+    symbol: str,
+    price: Any,
+    change: Any,
+    percent_change: Any,
+    previous_close: Any,
+    high: Any,
+    low: Any,
+    volume: Any,
+    exchange: Any,
+    timestamp: Optional[str],
+) -> str:
+    """Fill the current price template from raw, untyped field values."""
+    direction, change_str, percent_str = _describe_change(change, percent_change)
+    return _CURRENT_TMPL.format(
+        symbol=symbol,
+        price=price,
+        change_str=change_str,
+        percent_str=percent_str,
+        direction=direction,
+        previous_close=previous_close,
+        high=high,
+        low=low,
+        volume=volume,
+        exchange=exchange,
+        timestamp=timestamp if timestamp is not None else format_timestamp(),
+    )
+
+
+def _render_eod(
+    symbol: str,
+    date: Any,
+    open_price: Any,
+    close: Any,
+    high: Any,
+    low: Any,
+    volume: Any,
+    timestamp: Optional[str],
+) -> str:
+    """Fill the historical data template from raw, untyped field values."""
+    return _HIST_TMPL.format(
+        symbol=symbol,
+        datetime=date,
+        open=open_price,
+        close=close,
+        high=high,
+        low=low,
+        volume=volume,
+        timestamp=timestamp if timestamp is not None else format_timestamp(),
+    )
+
+
+def format_quote(quote: Quote, symbol: str, timestamp: Optional[str] = None) -> str:
+    """
+    Format a decoded quote struct into the current price response.
+    
+    Reads the struct's attributes directly, so no intermediate dict is built.
+    A change field missing from the payload counts as no change, while an
+    explicit null renders as N/A.
+    
+    Args:
+        quote: Decoded quote response
+        symbol: Stock symbol
+        timestamp: Optional preformatted retrieval time, so batch callers
+            can compute it once; defaults to the current time
+    
+    Returns:
+        Formatted text string with current price and change information
+    """
+    return _render_current(
+        symbol,
+        quote.close if quote.close is not None else 'N/A',
+        0 if quote.change is UNSET else quote.change,
+        0 if quote.percent_change is UNSET else quote.percent_change,
+        quote.previous_close if quote.previous_close is not None else 'N/A',
+        quote.high if quote.high is not None else 'N/A',
+        quote.low if quote.low is not None else 'N/A',
+        quote.volume if quote.volume is not None else 'N/A',
+        quote.exchange if quote.exchange is not None else 'N/A',
+        timestamp,
+    )
+
+
+def format_eod(eod: EOD, symbol: str, date: str, timestamp: Optional[str] = None) -> str:
+    """
+    Format a decoded EOD struct into the historical data response.
+    
+    Reads the struct's attributes directly, so no intermediate dict is built.
+    
+    Args:
+        eod: Decoded EOD response
+        symbol: Stock symbol
+        date: Requested date, used if the response carries no datetime
+        timestamp: Optional preformatted retrieval time; defaults to now
+    
+    Returns:
+        Formatted text string with historical stock information
+    """
+    return _render_eod(
+        symbol,
+        eod.datetime if eod.datetime is not None else date,
+        eod.open if eod.open is not None else 'N/A',
+        eod.close if eod.close is not None else 'N/A',
+        eod.high if eod.high is not None else 'N/A',
+        eod.low if eod.low is not None else 'N/A',
+        eod.volume if eod.volume is not None else 'N/A',
+        timestamp,
+    )
+
+
+def format_data(
+    data: Dict[str, Any],
+    symbol: str,
+    date: Optional[str] = None,
+    timestamp: Optional[str] = None
+) -> str:
     """
     Format stock data into a readable text response.
     
+    The dict is read as-is rather than converted to a struct, since callers
+    may pass numeric values that the string-typed schemas would reject.
+    
     Args:
         data: Stock data dictionary from API
         symbol: Stock symbol
         date: Optional date for historical data
+        timestamp: Optional preformatted retrieval time, so batch callers
+            can compute it once; defaults to the current time
     
     Returns:
         Formatted text string with stock information
     """
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
     if date:
         # Format historical closing price response using EOD data
-        close_price = data.get('close', 'N/A')
-        high = data.get('high', 'N/A')
-        low = data.get('low', 'N/A')
-        open_price = data.get('open', 'N/A')
-        volume = data.get('volume', 'N/A')
-        actual_date = data.get('datetime', date)
-            
-        return (
-            f"Stock Historical Data (EOD): {symbol}\n"
-            f"{'=' * 40}\n"
-            f"Date: {actual_date}\n"
-            f"Opening Price: ${open_price}\n"
-            f"Closing Price: ${close_price}\n"
-            f"Day High: ${high}\n"
-            f"Day Low: ${low}\n"
-            f"Volume: {volume}\n"
-            f"Retrieved at: {timestamp}\n"
+        return _render_eod(
+            symbol,
+            data.get('datetime', date),
+            data.get('open', 'N/A'),
+            data.get('close', 'N/A'),
+            data.get('high', 'N/A'),
+            data.get('low', 'N/A'),
+            data.get('volume', 'N/A'),
+            timestamp,
         )
     else:
         # Format current price response with change information
         # TwelveData quote endpoint returns comprehensive data
-        price = data.get('close', data.get('price', 'N/A'))
-        change = data.get('change', 0)
-        percent_change = data.get('percent_change', 0)
-        
-        # Determine direction indicator
-        if isinstance(change, (str, int, float)) and change != 'N/A':
-            try:
-                change_val = float(change)
-                percent_val = float(percent_change)
-                direction = "📈" if change_val >= 0 else "📉"
-                change_str = f"{'+' if change_val >= 0 else ''}{change_val:.2f}"
-                percent_str = f"{'+' if percent_val >= 0 else ''}{percent_val:.2f}%"
-            except (ValueError, TypeError):
-                direction = ""
-                change_str = str(change)
-                percent_str = str(percent_change)
-        else:
-            direction = ""
-            change_str = "N/A"
-            percent_str = "N/A"
-        
-        return (
-            f"Stock Price Data: {symbol}\n"
-            f"{'=' * 40}\n"
-            f"Current Price: ${price}\n"
-            f"Change: {change_str} ({percent_str}) {direction}\n"
-            f"Previous Close: ${data.get('previous_close', 'N/A')}\n"
-            f"Day High: ${data.get('high', 'N/A')}\n"
-            f"Day Low: ${data.get('low', 'N/A')}\n"
-            f"Volume: {data.get('volume', 'N/A')}\n"
-            f"Exchange: {data.get('exchange', 'N/A')}\n"
-            f"Retrieved at: {timestamp}\n"
-        )
\ No newline at end of file
+        return _render_current(
+            symbol,
+            data.get('close', data.get('price', 'N/A')),
+            data.get('change', 0),
+            data.get('percent_change', 0),
+            data.get('previous_close', 'N/A'),
+            data.get('high', 'N/A'),
+            data.get('low', 'N/A'),
+            data.get('volume', 'N/A'),
+            data.get('exchange', 'N/A'),
+            timestamp,
+        )
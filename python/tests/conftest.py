@@ -0,0 +1,43 @@
+import os
+
+import httpx
+import pytest
+
+# server.py reads its configuration at import time
+os.environ.setdefault("TWELVE_DATA_API_KEY", "test-key")
+
+from stock_mcp import server  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_disk_cache(tmp_path_factory):
+    """Point the persistent EOD cache at a pytest-managed temporary directory."""
+    original = server._CACHE_DIR
+    server._CACHE_DIR = str(tmp_path_factory.mktemp("stock_mcp_cache"))
+    yield
+    if server._disk_cache is not None:
+        server._disk_cache.close()
+        server._disk_cache = None
+    server._CACHE_DIR = original
+
+
+@pytest.fixture
+def quote_requests(monkeypatch):
+    """Serve quotes from a mock transport and record each requested symbol."""
+    requested = []
+
+    def handler(request):
+        symbol = request.url.params['symbol']
+        requested.append(symbol)
+        if symbol == 'BAD':
+            return httpx.Response(200, json={
+                "code": 404, "message": "symbol not found", "status": "error",
+            })
+        return httpx.Response(200, json={
+            "symbol": symbol, "close": "10", "change": "1", "percent_change": "10",
+        })
+
+    monkeypatch.setattr(server, '_client', httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    server._current_cache.clear()
+    yield requested
+    server._current_cache.clear()
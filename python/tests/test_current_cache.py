@@ -0,0 +1,42 @@
+import asyncio
+
+from stock_mcp import server
+
+
+def fetch(symbol):
+    return asyncio.run(server._fetch_current_stock_price(symbol))
+
+
+def test_repeat_lookup_is_served_from_cache(quote_requests):
+    first = fetch('aapl')
+    assert first.startswith('Stock Price Data: AAPL')
+    assert fetch('AAPL') == first
+    assert quote_requests == ['AAPL']
+
+
+def test_expired_entry_is_refetched(quote_requests):
+    fetch('AAPL')
+    stored_at, result = server._current_cache['AAPL']
+    server._current_cache['AAPL'] = (stored_at - server._CURRENT_CACHE_TTL, result)
+
+    fetch('AAPL')
+    assert quote_requests == ['AAPL', 'AAPL']
+
+
+def test_oldest_entry_is_evicted_when_full(quote_requests, monkeypatch):
+    monkeypatch.setattr(server, '_CACHE_MAX_ENTRIES', 2)
+    fetch('AAPL')
+    fetch('MSFT')
+    fetch('AAPL')  # refreshes AAPL, leaving MSFT least recently used
+    fetch('GOOG')
+
+    assert list(server._current_cache) == ['AAPL', 'GOOG']
+    fetch('MSFT')
+    assert quote_requests == ['AAPL', 'MSFT', 'GOOG', 'MSFT']
+
+
+def test_api_error_is_not_cached(quote_requests):
+    assert fetch('BAD') == 'API Error: symbol not found'
+    assert 'BAD' not in server._current_cache
+    fetch('BAD')
+    assert quote_requests == ['BAD', 'BAD']
@@ -0,0 +1,78 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from stock_mcp import server
+
+
+@pytest.fixture
+def eod_requests(tmp_path, monkeypatch):
+    """Serve EOD bars from a mock transport and record each requested date."""
+    requested = []
+
+    def handler(request):
+        date = request.url.params['date']
+        requested.append(date)
+        return httpx.Response(200, json={
+            "symbol": "AAPL", "datetime": date,
+            "open": "1", "high": "2", "low": "0.5", "close": "1.5", "volume": "10",
+        })
+
+    monkeypatch.setattr(server, '_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(server, '_disk_cache', None)
+    monkeypatch.setattr(server, '_client', httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    server._eod_cache.clear()
+    yield requested
+    if server._disk_cache is not None:
+        server._disk_cache.close()
+    server._eod_cache.clear()
+
+
+def fetch(date):
+    return asyncio.run(server._fetch_historical_stock_price('aapl', date))
+
+
+def next_unfinished_weekday():
+    day = datetime.now(server._EXCHANGE_TZ).date()
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return day.isoformat()
+
+
+def test_only_days_finished_in_new_york_are_complete():
+    today_ny = datetime.now(server._EXCHANGE_TZ).replace(tzinfo=None)
+    assert not server._is_completed_trading_day(today_ny)
+    assert not server._is_completed_trading_day(today_ny + timedelta(days=1))
+    assert server._is_completed_trading_day(today_ny - timedelta(days=1))
+
+
+def test_past_day_is_read_back_from_disk(eod_requests):
+    first = fetch('2024-01-16')
+    assert 'Closing Price: $1.5' in first
+
+    server._eod_cache.clear()
+    assert fetch('2024-01-16') == first
+    assert eod_requests == ['2024-01-16']
+
+
+def test_unfinished_day_is_not_persisted(eod_requests):
+    date = next_unfinished_weekday()
+    fetch(date)
+
+    assert server._get_disk_cache().get(('AAPL', date)) is None
+    fetch(date)
+    assert eod_requests == [date, date]
+
+
+def test_unusable_disk_cache_does_not_fail_requests(eod_requests, tmp_path, monkeypatch):
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    monkeypatch.setattr(server, '_CACHE_DIR', str(blocker / 'cache'))
+
+    result = fetch('2024-01-16')
+    assert result.startswith('Stock Historical Data (EOD): AAPL')
+    server._eod_cache.clear()
+    assert fetch('2024-01-16') == result
+    assert eod_requests == ['2024-01-16', '2024-01-16']
@@ -0,0 +1,41 @@
+import asyncio
+
+from stock_mcp import server
+
+
+def fetch_batch(symbols):
+    return asyncio.run(server.get_multiple_stock_prices(symbols))
+
+
+def headers(text):
+    return [block.strip().splitlines()[0] for block in text.split("\n\n") if block.strip()]
+
+
+def test_results_follow_request_order(quote_requests):
+    result = fetch_batch(['MSFT', 'aapl', 'GOOG'])
+    assert headers(result) == [
+        'Stock Price Data: MSFT', 'Stock Price Data: AAPL', 'Stock Price Data: GOOG',
+    ]
+
+
+def test_duplicate_symbols_share_one_request(quote_requests):
+    result = fetch_batch(['AAPL', 'aapl', 'AAPL'])
+    assert headers(result) == ['Stock Price Data: AAPL'] * 3
+    assert quote_requests == ['AAPL']
+
+
+def test_exceptions_become_error_entries(quote_requests, monkeypatch):
+    fetch_current = server._fetch_current_stock_price
+
+    async def flaky(symbol, timestamp=None):
+        if symbol == 'MSFT':
+            raise RuntimeError("boom")
+        return await fetch_current(symbol, timestamp)
+
+    monkeypatch.setattr(server, '_fetch_current_stock_price', flaky)
+    result = fetch_batch(['AAPL', 'MSFT', 'BAD'])
+    assert headers(result) == [
+        'Stock Price Data: AAPL',
+        'Error: Error fetching stock data for MSFT: boom',
+        'API Error: symbol not found',
+    ]
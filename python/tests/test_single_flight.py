@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from stock_mcp import server
+
+
+def test_concurrent_callers_share_one_fetch():
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def main():
+        return await asyncio.gather(*(server._single_flight("MSFT", fetch) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["result"] * 5
+    assert calls == 1
+    assert server._inflight == {}
+
+
+def test_cancelled_caller_does_not_cancel_waiters():
+    async def main():
+        gate = asyncio.Event()
+
+        async def fetch():
+            await gate.wait()
+            return "result"
+
+        first = asyncio.ensure_future(server._single_flight("MSFT", fetch))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(server._single_flight("MSFT", fetch))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        gate.set()
+        return await second
+
+    assert asyncio.run(main()) == "result"
+    assert server._inflight == {}
+
+
+def test_fetch_exception_reaches_every_caller():
+    async def fetch():
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    async def main():
+        return await asyncio.gather(
+            *(server._single_flight("MSFT", fetch) for _ in range(2)),
+            return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert server._inflight == {}
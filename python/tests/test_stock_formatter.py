@@ -0,0 +1,41 @@
+import pytest
+
+from stock_mcp.schemas import quote_decoder
+from stock_mcp.stock_formatter import format_data, format_quote
+
+
+def change_line(change, percent_change):
+    data = {'close': '10', 'change': change, 'percent_change': percent_change}
+    return format_data(data, 'AAPL', timestamp='t').splitlines()[3]
+
+
+@pytest.mark.parametrize('change, percent_change, expected', [
+    ('1.234', '0.5', 'Change: +1.23 (+0.50%) 📈'),
+    ('-0.2', '-1', 'Change: -0.20 (-1.00%) 📉'),
+    (' 1.2', '1.2 ', 'Change: +1.20 (+1.20%) 📈'),
+    ('inf', '-inf', 'Change: +inf (-inf%) 📈'),
+    ('nan', 'nan', 'Change: nan (nan%) 📉'),
+    ('x', 'y', 'Change: x (y) '),
+    ('N/A', '1', 'Change: N/A (N/A) '),
+    (None, None, 'Change: N/A (N/A) '),
+    (1.5, 2, 'Change: +1.50 (+2.00%) 📈'),
+])
+def test_change_rendering(change, percent_change, expected):
+    assert change_line(change, percent_change) == expected
+
+
+@pytest.mark.parametrize('payload, expected', [
+    (b'{"close": "10", "change": null, "percent_change": null}', 'Change: N/A (N/A) '),
+    (b'{"close": "10"}', 'Change: +0.00 (+0.00%) 📈'),
+    (b'{"close": "10", "change": "-1", "percent_change": "-9.09"}', 'Change: -1.00 (-9.09%) 📉'),
+])
+def test_decoded_quote_change_rendering(payload, expected):
+    quote = quote_decoder.decode(payload)
+    assert format_quote(quote, 'AAPL', timestamp='t').splitlines()[3] == expected
+
+
+def test_numeric_values_are_formatted():
+    text = format_data({'close': 10.0, 'change': 1.5, 'percent_change': 2}, 'A', timestamp='t')
+    assert text.splitlines()[2:4] == ['Current Price: $10.0', 'Change: +1.50 (+2.00%) 📈']
+    text = format_data({'close': 10.0, 'volume': 5}, 'A', date='2024-01-16', timestamp='t')
+    assert 'Closing Price: $10.0' in text and 'Volume: 5' in text
@@ -0,0 +1,28 @@
+import asyncio
+
+import pytest
+
+from stock_mcp import server
+
+
+@pytest.mark.parametrize('symbol', [
+    'AAPL', 'aapl', 'BRK.B', 'BF-B', 'EUR/USD', 'BTC/USD', 'TRP:TSX', 'A', 'ABCDEFGHIJ',
+])
+def test_accepted_symbols(symbol):
+    assert server._SYMBOL_RE.fullmatch(symbol)
+
+
+@pytest.mark.parametrize('symbol', [
+    '../../x', '..', 'a//b', 'a..b', '/AAPL', 'AAPL/', 'A B', '', 'ABCDEFGHIJK', 'AAPL\n',
+])
+def test_rejected_symbols(symbol):
+    assert not server._SYMBOL_RE.fullmatch(symbol)
+
+
+def test_rejected_symbol_never_reaches_the_network(monkeypatch):
+    async def fail(*args, **kwargs):
+        raise AssertionError("network call made for an invalid symbol")
+
+    monkeypatch.setattr(server, '_single_flight', fail)
+    result = asyncio.run(server.get_multiple_stock_prices(['../../x']))
+    assert result == "Error: Invalid symbol '../../x'"